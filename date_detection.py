@@ -2,6 +2,7 @@
 Multilingual date detection for YouTube Music playedAt values
 Supports 50+ languages including Latin, Cyrillic, Arabic, CJK, and Indic scripts
 """
+import functools
 import re
 from typing import Dict, Set, List, Optional, NamedTuple
 
@@ -165,9 +166,13 @@ YESTERDAY_TRANSLATIONS = {
 }
 
 
+@functools.lru_cache(maxsize=256)
 def detect_date_value(played_at: Optional[str]) -> DateDetectionResult:
     """
     Detect if a playedAt value represents today or yesterday in any supported language
+
+    History only carries a handful of distinct playedAt strings, so results are
+    cached per value.
     
     Args:
         played_at: The playedAt string from YouTube Music
@@ -10,6 +10,8 @@ load_dotenv()
 
 api_head = 'http://ws.audioscrobbler.com/2.0/'
 secret = os.environ['LAST_FM_API_SECRET']
+# Shared by scrobble_batch so consecutive batches reuse one keep-alive connection
+session = requests.Session()
 
 
 def authorize(user_token):
@@ -55,6 +57,24 @@ def scrobble(song_name, artist_name, album_name, session_key, timestamp=str(int(
     return apiResp.text
 
 
+def scrobble_batch(tracks, session_key):
+    # tracks: (song_name, artist_name, album_name, timestamp) tuples, at most 50 per call
+    params = {
+        'method': 'track.scrobble',
+        'api_key': os.environ['LAST_FM_API'],
+        'sk': session_key
+    }
+    for i, (song_name, artist_name, album_name, timestamp) in enumerate(tracks):
+        params[f'track[{i}]'] = song_name
+        params[f'artist[{i}]'] = artist_name
+        params[f'album[{i}]'] = album_name
+        params[f'timestamp[{i}]'] = timestamp
+    requestHash = hashRequest(params, secret)
+    params['api_sig'] = requestHash
+    apiResp = session.post(api_head, params)
+    return apiResp.text
+
+
 def hashRequest(obj, secretKey):
     string = ''
     items = list(obj.keys())
@@ -7,6 +7,46 @@ import os
 import requests
 from datetime import UTC, datetime
 from typing import Mapping, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+
+# (connect, read) timeouts so a hung Discord endpoint cannot stall the workflow.
+WEBHOOK_TIMEOUT = (3.05, 10)
+# Test/placeholder webhook hosts that should never receive a real POST.
+PLACEHOLDER_WEBHOOK_PREFIXES = ("https://example", "https://webhook.test")
+
+# Shared session so every webhook post in a run reuses one pooled TLS connection
+# (all posts go to the single Discord host).
+# Discord 429/5xx responses are retried up to five times with jittered
+# exponential backoff capped at 30 seconds, honouring Retry-After.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=Retry(
+    total=5,
+    backoff_factor=0.5,
+    backoff_jitter=0.5,
+    backoff_max=30,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["POST"],
+    respect_retry_after_header=True,
+)))
+
+
+def get_webhook_url() -> Optional[str]:
+    """Read DISCORD_WEBHOOK_URL at call time, like CI_DRY_RUN in is_webhook_dry_run."""
+    return os.environ.get('DISCORD_WEBHOOK_URL', '').strip() or None
+
+
+def is_webhook_dry_run(webhook_url: str) -> bool:
+    """Return True when webhook posts should be skipped (CI_DRY_RUN or placeholder URL)."""
+    if os.environ.get('CI_DRY_RUN', '').strip().lower() in ('1', 'true', 'yes'):
+        return True
+    return webhook_url.startswith(PLACEHOLDER_WEBHOOK_PREFIXES)
+
+
+def is_valid_webhook_url(webhook_url: str) -> bool:
+    """Discord webhooks are https-only; anything else is a misconfigured secret."""
+    return webhook_url.startswith("https://")
 
 
 def build_sync_footer_text(
@@ -24,6 +64,13 @@ def build_sync_footer_text(
     return " • ".join(footer_parts)
 
 
+# Fixed English month names; strftime('%b') goes through the process locale.
+_MONTH_ABBREVIATIONS = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+)
+
+
 def format_report_date(now_utc: datetime) -> str:
     """Format date as `12th May '27`."""
     day = now_utc.day
@@ -35,7 +82,7 @@ def format_report_date(now_utc: datetime) -> str:
         ordinal = "rd"
     else:
         ordinal = "th"
-    return f"{day}{ordinal} {now_utc.strftime('%b')} '{now_utc.strftime('%y')}"
+    return f"{day}{ordinal} {_MONTH_ABBREVIATIONS[now_utc.month - 1]} '{now_utc.year % 100:02d}"
 
 
 def format_listening_duration(total_minutes: int) -> str:
@@ -45,6 +92,14 @@ def format_listening_duration(total_minutes: int) -> str:
     return f"{listening_hours}h {listening_mins}m"
 
 
+def format_capped_song_lines(songs: list, max_items: int) -> list:
+    """Format up to `max_items` songs as bullet lines, summarizing the rest."""
+    lines = [f"- {song}" for song in songs[:max_items]]
+    if len(songs) > max_items:
+        lines.append(f"- +{len(songs) - max_items} more")
+    return lines
+
+
 def extract_flow_minutes(flow: Optional[Mapping[str, int]]) -> tuple[int, int, int]:
     """Get Evening, Afternoon, Late Night minutes with safe defaults."""
     flow = flow or {}
@@ -102,10 +157,16 @@ def send_success_notification(
         longest_streak_minutes: Duration of longest streak in minutes
         report_now: timezone-aware datetime to use for report date
     """
-    webhook_url = os.environ.get('DISCORD_WEBHOOK_URL')
+    webhook_url = get_webhook_url()
     if not webhook_url:
         print("DISCORD_WEBHOOK_URL not set. Skipping notification.")
         return
+    if is_webhook_dry_run(webhook_url):
+        print("Discord webhook dry run. Skipping notification.")
+        return
+    if not is_valid_webhook_url(webhook_url):
+        print("Error: DISCORD_WEBHOOK_URL is not an https:// URL. Skipping notification.")
+        return
 
     # Only send notification if there were successful scrobbles
     if scrobbled_count == 0:
@@ -124,14 +185,7 @@ def send_success_notification(
     estimated_minutes = scrobbled_count * 4
     listening_value = format_listening_duration(estimated_minutes)
 
-    liked_today_lines = []
-    if loved_songs:
-        max_items = 5
-        liked_today_lines.extend([f"- {song}" for song in loved_songs[:max_items]])
-        if len(loved_songs) > max_items:
-            liked_today_lines.append(f"- +{len(loved_songs) - max_items} more")
-    else:
-        liked_today_lines.append("- None")
+    liked_today_lines = format_capped_song_lines(loved_songs, max_items=5) if loved_songs else ["- None"]
 
     evening_minutes, afternoon_minutes, late_night_minutes = extract_flow_minutes(listening_flow_minutes)
 
@@ -155,9 +209,7 @@ def send_success_notification(
     ]
     if love_failed_count > 0 and love_failed_songs:
         body_lines.append("## Love Failures")
-        body_lines.extend([f"- {song}" for song in love_failed_songs[:10]])
-        if len(love_failed_songs) > 10:
-            body_lines.append(f"- +{len(love_failed_songs) - 10} more")
+        body_lines.extend(format_capped_song_lines(love_failed_songs, max_items=10))
 
     body_lines.append("")
     body_lines.append(f"> {footer_text}")
@@ -165,13 +217,111 @@ def send_success_notification(
     payload = {"content": "\n".join(body_lines)}
 
     try:
-        response = requests.post(webhook_url, json=payload)
+        response = _session.post(webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
         response.raise_for_status()
         print("Successfully sent Discord notification.")
     except requests.exceptions.RequestException as e:
         print(f"Failed to send Discord notification: {e}")
 
 
+def build_failure_embed(
+    scrobble_log: str,
+    run_id: str = "N/A",
+    run_attempt: str = "N/A"
+) -> dict:
+    """Build the detailed Discord failure embed for a GitHub Actions scrobble job."""
+    # In GitHub Actions environment, the most common cause of failure is expired cookie
+    # Since logs are often minimal when the script fails, we'll provide direct guidance for the most likely issue
+    failure_reason = "❌ YouTube Music cookie likely expired or invalid"
+    resolution_steps = (
+        "**Resolution (Most Important):**\n"
+        "Your YouTube Music cookie has likely expired and needs to be refreshed.\n\n"
+        "**Steps to update your cookie:**\n"
+        "1. Sign in to YouTube Music: https://music.youtube.com\n"
+        "2. Open Developer Tools (F12)\n"
+        "3. Go to Network tab\n"
+        "4. Refresh the page and find any request to music.youtube.com\n"
+        "5. Copy the 'Cookie' header value\n"
+        "6. Update the `YTMUSIC_COOKIE` in your GitHub repository secrets\n\n"
+        "**Note:** YouTube Music cookies typically expire every few days, so this is expected behavior."
+    )
+    color = 15105570  # Orange color for authentication issues
+    now = datetime.now(UTC)
+    log_tail = scrobble_log[-600:]
+
+    return {
+        "embeds": [
+            {
+                "title": "❌ YouTube Music Scrobble Sync Failed!",
+                "description": failure_reason,
+                "color": color,
+                "fields": [
+                    {
+                        "name": "📋 Update Required",
+                        "value": resolution_steps,
+                        "inline": False
+                    },
+                    {
+                        "name": "📋 Other Possible Causes",
+                        "value": (
+                            "• Last.fm API credentials may need refreshing\n"
+                            "• Network connectivity issues\n"
+                            "• Temporary service unavailability"
+                        ),
+                        "inline": False
+                    },
+                    {
+                        "name": "🔍 Raw Logs",
+                        "value": f"```\n{log_tail}\n```",
+                        "inline": False
+                    }
+                ],
+                "footer": {
+                    "text": f"Run ID: {run_id} | Attempt: {run_attempt} | {now.strftime('%Y-%m-%d %H:%M:%S UTC')}"
+                },
+                "timestamp": now.isoformat()
+            }
+        ]
+    }
+
+
+def send_failure_notification_from_env() -> bool:
+    """
+    Send the detailed failure notification using the GitHub Actions environment.
+
+    Reads DISCORD_WEBHOOK_URL, SCROBBLE_LOG, GITHUB_RUN_ID and GITHUB_RUN_ATTEMPT.
+
+    Returns:
+        True if the notification was delivered, False otherwise
+    """
+    env = os.environ
+    webhook_url = get_webhook_url()
+    if not webhook_url:
+        print("Error: DISCORD_WEBHOOK_URL environment variable not set")
+        return False
+    if is_webhook_dry_run(webhook_url):
+        print("Discord webhook dry run. Skipping failure notification.")
+        return True
+    if not is_valid_webhook_url(webhook_url):
+        print("Error: DISCORD_WEBHOOK_URL is not an https:// URL")
+        return False
+
+    scrobble_log = env.get('SCROBBLE_LOG', 'No log available')
+    run_id = env.get('GITHUB_RUN_ID', 'N/A')
+    run_attempt = env.get('GITHUB_RUN_ATTEMPT', 'N/A')
+
+    embed = build_failure_embed(scrobble_log, run_id=run_id, run_attempt=run_attempt)
+
+    try:
+        response = _session.post(webhook_url, json=embed, timeout=WEBHOOK_TIMEOUT)
+        response.raise_for_status()
+        print("Discord notification sent successfully")
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"Error sending Discord notification: {e}")
+        return False
+
+
 def send_failure_notification(error_message: str = None):
     """
     Send a Discord notification for failed scrobbling.
@@ -182,10 +332,16 @@ def send_failure_notification(error_message: str = None):
     Args:
         error_message: Optional error message to include in the notification
     """
-    webhook_url = os.environ.get('DISCORD_WEBHOOK_URL')
+    webhook_url = get_webhook_url()
     if not webhook_url:
         print("DISCORD_WEBHOOK_URL not set. Skipping failure notification.")
         return
+    if is_webhook_dry_run(webhook_url):
+        print("Discord webhook dry run. Skipping failure notification.")
+        return
+    if not is_valid_webhook_url(webhook_url):
+        print("Error: DISCORD_WEBHOOK_URL is not an https:// URL. Skipping failure notification.")
+        return
 
     failure_reason = "❌ YouTube Music Scrobble Sync Failed!"
     if error_message:
@@ -201,7 +357,7 @@ def send_failure_notification(error_message: str = None):
     }
 
     try:
-        response = requests.post(webhook_url, json=payload)
+        response = _session.post(webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
         response.raise_for_status()
         print("Successfully sent failure Discord notification.")
     except requests.exceptions.RequestException as e:
@@ -0,0 +1,134 @@
+"""
+SQLite persistence for scrobble positions and loved tracks
+"""
+import logging
+import sqlite3
+from datetime import UTC, datetime
+from typing import Iterable, List, Tuple
+
+SongKey = Tuple[str, str, str]
+
+# Bump when _create_schema gains a migration; stored in PRAGMA user_version.
+SCHEMA_VERSION = 2
+
+_SQL_SELECT_SCROBBLES = '''
+    SELECT track_name, artist_name, album_name, array_position,
+           max_array_position, is_first_time_scrobble
+    FROM scrobbles
+'''
+_SQL_DELETE_SCROBBLE = 'DELETE FROM scrobbles WHERE track_name = ? AND artist_name = ? AND album_name = ?'
+_SQL_UPSERT_POSITION = '''
+    INSERT INTO scrobbles (track_name, artist_name, album_name, array_position, max_array_position, is_first_time_scrobble, scrobbled_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (track_name, artist_name, album_name) DO UPDATE SET
+        array_position = excluded.array_position,
+        max_array_position = MAX(COALESCE(max_array_position, excluded.array_position), excluded.array_position),
+        scrobbled_at = excluded.scrobbled_at
+'''
+_SQL_IS_LOVED = 'SELECT 1 FROM loved_tracks WHERE track_name = ? AND artist_name = ?'
+_SQL_MARK_LOVED = 'INSERT OR IGNORE INTO loved_tracks (track_name, artist_name) VALUES (?, ?)'
+
+logger = logging.getLogger('ytm-scrobbler.store')
+
+
+class ScrobbleStore:
+    """Owns the data.db connection and every statement run against it."""
+
+    def __init__(self, path: str = './data.db'):
+        self.conn = sqlite3.connect(path)
+        # Stay on the default rollback journal: CI caches data.db alone, so a WAL
+        # side file would be dropped. NORMAL still avoids the extra journal fsyncs.
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self._create_schema()
+
+    def _create_schema(self):
+        cursor = self.conn.cursor()
+        if cursor.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            cursor.close()
+            return
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scrobbles (
+                id INTEGER PRIMARY KEY,
+                track_name TEXT,
+                artist_name TEXT,
+                album_name TEXT,
+                scrobbled_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                array_position INTEGER,
+                max_array_position INTEGER,
+                is_first_time_scrobble BOOLEAN DEFAULT FALSE
+            )
+        ''')
+
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(scrobbles)')}
+        if 'max_array_position' not in columns:
+            cursor.execute('ALTER TABLE scrobbles ADD COLUMN max_array_position INTEGER')
+        if 'is_first_time_scrobble' not in columns:
+            cursor.execute('ALTER TABLE scrobbles ADD COLUMN is_first_time_scrobble BOOLEAN DEFAULT FALSE')
+
+        # ON CONFLICT in upsert_positions needs a unique key; older databases may
+        # hold duplicate rows, so keep the first of each before creating the index.
+        # This runs even under --dry-run, so the deleted rows are always reported.
+        cursor.execute('''
+            DELETE FROM scrobbles WHERE id NOT IN (
+                SELECT MIN(id) FROM scrobbles GROUP BY track_name, artist_name, album_name
+            )
+        ''')
+        if cursor.rowcount > 0:
+            logger.warning(
+                "Schema migration removed %d duplicate scrobbles row(s), keeping the oldest row per track",
+                cursor.rowcount
+            )
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_scrobbles_track_artist_album
+            ON scrobbles (track_name, artist_name, album_name)
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS loved_tracks (
+                id INTEGER PRIMARY KEY,
+                track_name TEXT,
+                artist_name TEXT,
+                loved_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(track_name, artist_name)
+            )
+        ''')
+
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.conn.commit()
+        cursor.close()
+
+    def load_scrobbles(self) -> List[tuple]:
+        """
+        Return every scrobbles row as (track, artist, album, array_position,
+        max_array_position, is_first_time_scrobble).
+        """
+        return self.conn.execute(_SQL_SELECT_SCROBBLES).fetchall()
+
+    def delete_scrobbles(self, keys: Iterable[SongKey]):
+        """Delete the rows for the given (track, artist, album) keys and commit."""
+        self.conn.executemany(_SQL_DELETE_SCROBBLE, keys)
+        self.conn.commit()
+
+    def upsert_positions(self, rows: Iterable[Tuple[str, str, str, int, bool]]):
+        """
+        Insert or update (track, artist, album, position, is_first_time) rows.
+        max_array_position only ever grows. Not committed; see commit().
+        The whole batch shares one scrobbled_at, in CURRENT_TIMESTAMP's format.
+        """
+        now = datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S')
+        self.conn.executemany(_SQL_UPSERT_POSITION, (
+            (title, artist, album, position, position, is_first_time, now)
+            for title, artist, album, position, is_first_time in rows
+        ))
+
+    def is_loved(self, title: str, artist: str) -> bool:
+        return self.conn.execute(_SQL_IS_LOVED, (title, artist)).fetchone() is not None
+
+    def mark_loved(self, title: str, artist: str):
+        """Record a loved track. Not committed; see commit()."""
+        self.conn.execute(_SQL_MARK_LOVED, (title, artist))
+
+    def commit(self):
+        self.conn.commit()
@@ -2,11 +2,13 @@
 Smart scrobbling utilities with improved timestamp distribution and error handling
 Based on ytmusic-scrobbler-web worker implementation
 """
+import functools
 import time
 import math
 import re
 import logging
 from enum import Enum
+from types import MappingProxyType
 from typing import Dict, List, Optional
 import hashlib
 import xml.etree.ElementTree as ET
@@ -14,6 +16,10 @@ import requests
 import lastpy
 
 
+# Maximum number of tracks Last.fm accepts in a single track.scrobble request
+LASTFM_MAX_BATCH_SIZE = 50
+
+
 class FailureType(Enum):
     AUTH = "AUTH"
     NETWORK = "NETWORK"
@@ -22,6 +28,72 @@ class FailureType(Enum):
     UNKNOWN = "UNKNOWN"
 
 
+# Metadata cleaning patterns, compiled once at import time.
+# Remove " - Topic" (common on auto-generated artist channels)
+_TOPIC_SUFFIX_RE = re.compile(r'(?i)\s+-\s+Topic$')
+
+# We use (?i) for case-insensitivity.
+_CLEAN_PATTERNS = [re.compile(pattern) for pattern in (
+    # --- NEW: VIEW COUNTS (Specifically for your issue) ---
+    # Catches "Artist Name, 509K views" or "Artist 1M views"
+    r'(?i)(?:,?\s*)?\d+(?:[\.,]\d+)?\s*[KMB]?\s*views',
+
+    # --- VIDEO GARBAGE ---
+    # (Official Video), [Official Audio], (Lyrics), (Visualizer), (MV), (Music Video)
+    # Also catches technical specs like [4K], [HQ], [HD]
+    r'(?i)\s*[\(\[](?:official\s*)?(?:music\s*)?(?:video|audio|lyrics|visualizer|clip|mv|hq|hd|4k|1080p)(?:.*?)?[\)\]]',
+
+    # --- MARKETING / EDITIONS ---
+    # (2011 Remaster), [Deluxe Edition], (Anniversary Edition), (Expanded)
+    # Note: We intentionally DO NOT remove "Remix" so remixes stay separate.
+    r'(?i)\s*[\(\[](?:.*?)?(?:remaster|deluxe|edition|anniversary|expanded|re-master|mastered)(?:.*?)?[\)\]]',
+    r'(?i)\s*-\s*.*?(?:remaster|deluxe|edition|anniversary|expanded|re-master|mastered).*?$',
+
+    # --- FEATURES (Standardize to Main Artist) ---
+    # (feat. X), (ft. X), (featuring X), (with X) inside brackets
+    r'(?i)\s*[\(\[](?:feat|ft\.|featuring|with|prod\.)\s+.*?[\)\]]',
+    # "Song Name feat. X" (without brackets, at end of string)
+    r'(?i)\s+(?:feat|ft\.|featuring|with|prod\.)\s+.*$',
+
+    # --- VERSIONS / EDITS ---
+    # (Radio Edit), (Single Edit), (Album Version), (Explicit), (Clean)
+    # (Mono), (Stereo)
+    r'(?i)\s*[\(\[](?:.*?)?(?:radio\s*edit|single\s*edit|album\s*version|explicit|clean|mono|stereo)(?:.*?)?[\)\]]',
+
+    # --- LIVE PERFORMANCES ---
+    # (Live), (Live at Wembley).
+    r'(?i)\s*[\(\[](?:.*?)?live(?:.*?)?[\)\]]',
+    r'(?i)\s*-\s*live(?:.*?)?$',
+
+    # --- ALBUM SUFFIXES ---
+    # "Album Name - Single", "Album Name - EP"
+    r'(?i)\s+-\s+(?:single|ep)$',
+)]
+
+# Every cleaning pattern needs a bracket, a dash, "views" or a featuring
+# keyword to match; titles without any of these skip the removal passes.
+_CLEAN_TRIGGER_RE = re.compile(r'(?i)[\(\[-]|views|\s(?:feat|ft\.|featuring|with|prod\.)\s')
+
+# Remove empty brackets if any remain "Song []"
+_EMPTY_BRACKETS_RE = re.compile(r'\s*[\(\[]\s*[\)\]]')
+_MULTISPACE_RE = re.compile(r'\s+')
+
+# Technical sanitization patterns used by sanitize_for_lastfm
+_UNICODE_ESCAPE_RE = re.compile(r'\\u([0-9A-Fa-f]{4})')
+# Single str.translate pass: typographic punctuation is normalized and
+# control characters / invalid Unicode are deleted.
+_SANITIZE_TABLE = str.maketrans({
+    '\u2026': '...',  # ellipsis
+    '\u2013': '-',    # en dash
+    '\u2014': '-',    # em dash
+    '\u2018': "'",    # left single quotation mark
+    '\u2019': "'",    # right single quotation mark
+    '\u201C': '"',    # left double quotation mark
+    '\u201D': '"',    # right double quotation mark
+    **{chr(c): None for c in [*range(0x20), 0x7F, 0xFFFE, 0xFFFF]},
+})
+
+
 def clean_metadata(text: str) -> str:
     """
     The 'Nuclear Option' for metadata cleaning.
@@ -30,83 +102,85 @@ def clean_metadata(text: str) -> str:
     """
     if not text:
         return ""
+
+    # Fast path: nothing for the removal patterns to match
+    if not _CLEAN_TRIGGER_RE.search(text):
+        return _MULTISPACE_RE.sub(' ', text).strip()
         
     # 1. Decode generic YouTube junk first
-    # Remove " - Topic" (common on auto-generated artist channels)
-    text = re.sub(r'(?i)\s+-\s+Topic$', '', text)
-    
-    # 2. Define removal patterns
-    # We use (?i) for case-insensitivity.
-    patterns = [
-        # --- NEW: VIEW COUNTS (Specifically for your issue) ---
-        # Catches "Artist Name, 509K views" or "Artist 1M views"
-        r'(?i)(?:,?\s*)?\d+(?:[\.,]\d+)?\s*[KMB]?\s*views',
-
-        # --- VIDEO GARBAGE ---
-        # (Official Video), [Official Audio], (Lyrics), (Visualizer), (MV), (Music Video)
-        # Also catches technical specs like [4K], [HQ], [HD]
-        r'(?i)\s*[\(\[](?:official\s*)?(music\s*)?(video|audio|lyrics|visualizer|clip|mv|hq|hd|4k|1080p)(?:.*?)?[\)\]]',
-
-        # --- MARKETING / EDITIONS ---
-        # (2011 Remaster), [Deluxe Edition], (Anniversary Edition), (Expanded)
-        # Note: We intentionally DO NOT remove "Remix" so remixes stay separate.
-        r'(?i)\s*[\(\[](?:.*?)?(remaster|deluxe|edition|anniversary|expanded|re-master|mastered)(?:.*?)?[\)\]]',
-        r'(?i)\s*-\s*.*?(remaster|deluxe|edition|anniversary|expanded|re-master|mastered).*?$',
-
-        # --- FEATURES (Standardize to Main Artist) ---
-        # (feat. X), (ft. X), (featuring X), (with X) inside brackets
-        r'(?i)\s*[\(\[](?:feat|ft\.|featuring|with|prod\.)\s+.*?[\)\]]',
-        # "Song Name feat. X" (without brackets, at end of string)
-        r'(?i)\s+(?:feat|ft\.|featuring|with|prod\.)\s+.*$',
-
-        # --- VERSIONS / EDITS ---
-        # (Radio Edit), (Single Edit), (Album Version), (Explicit), (Clean)
-        # (Mono), (Stereo)
-        r'(?i)\s*[\(\[](?:.*?)?(radio\s*edit|single\s*edit|album\s*version|explicit|clean|mono|stereo)(?:.*?)?[\)\]]',
-
-        # --- LIVE PERFORMANCES ---
-        # (Live), (Live at Wembley). 
-        r'(?i)\s*[\(\[](?:.*?)?(live)(?:.*?)?[\)\]]',
-        r'(?i)\s*-\s*live(?:.*?)?$',
-
-        # --- ALBUM SUFFIXES ---
-        # "Album Name - Single", "Album Name - EP"
-        r'(?i)\s+-\s+(?:single|ep)$'
-    ]
+    text = _TOPIC_SUFFIX_RE.sub('', text)
     
-    for pattern in patterns:
-        text = re.sub(pattern, '', text)
+    # 2. Apply removal patterns
+    for pattern in _CLEAN_PATTERNS:
+        text = pattern.sub('', text)
         
     # 3. Final Polish
-    # Remove empty brackets if any remain "Song []"
-    text = re.sub(r'\s*[\(\[]\s*[\)\]]', '', text)
+    text = _EMPTY_BRACKETS_RE.sub('', text)
     # Remove double spaces
-    text = re.sub(r'\s+', ' ', text)
+    text = _MULTISPACE_RE.sub(' ', text)
     
     return text.strip()
 
 
+def _decode_unicode_escape(match: re.Match) -> str:
+    """Replacement callback turning a literal \\uXXXX escape into its character."""
+    return chr(int(match.group(1), 16))
+
+
+@functools.lru_cache(maxsize=4096)
+def sanitize_for_lastfm(s: str) -> str:
+    """
+    Sanitize a track/artist/album string for the Last.fm API.
+    Pure function of its input, so results are memoized: the same artists
+    and albums recur constantly in listening history.
+    """
+    
+    # --- PHASE 1: NUCLEAR CLEANING ---
+    s = clean_metadata(s)
+    # ---------------------------------
+
+    # --- PHASE 2: TECHNICAL SANITIZATION ---
+    # Literal \uXXXX escapes are rare; only run the regex when one may be present
+    if '\\u' in s:
+        s = _UNICODE_ESCAPE_RE.sub(_decode_unicode_escape, s)
+    
+    # Normalize typographic punctuation and remove control characters and
+    # invalid Unicode in a single pass
+    s = s.translate(_SANITIZE_TABLE)
+    
+    return s
+
+
+def parse_batch_scrobble_statuses(xml_response: str) -> Optional[List[bool]]:
+    """
+    Per-track outcome of a batched Last.fm track.scrobble response, in
+    request order: True unless Last.fm reports the scrobble as ignored.
+    Returns None if there is no <scrobbles> element.
+    """
+    root = ET.fromstring(xml_response)
+    scrobbles = root.find('scrobbles')
+    if scrobbles is None:
+        return None
+
+    statuses = []
+    for scrobble in scrobbles.findall('scrobble'):
+        ignored_message = scrobble.find('ignoredMessage')
+        code = ignored_message.get('code', '0') if ignored_message is not None else '0'
+        statuses.append(code == '0')
+    return statuses
+
+
+# Timestamp distribution constants
+_MIN_OFFSET_SECONDS = 30  # Minimum 30 seconds ago
+_E_MINUS_1 = math.e - 1.0
+
+
 class ScrobbleTimestampCalculator:
     """Smart timestamp calculator with different distribution strategies"""
     
     @staticmethod
-    def calculate_scrobble_timestamp(
-        songs_scrobbled_so_far: int,
-        total_songs_to_scrobble: int,
-        is_pro_user: bool = False,
-        is_first_time_scrobbling: bool = False
-    ) -> str:
-        """
-        Calculate timestamp using a DYNAMIC window based on song count.
-        This prevents 'Overlap' where a new batch of songs gets pushed 
-        so far back in time that it mixes with the previous batch.
-        """
-        now = int(time.time())
-        
-        # If only one song, place it 30 seconds ago
-        if total_songs_to_scrobble == 1:
-            return str(now - 30)
-        
+    def _distribution_seconds(total_songs_to_scrobble: int, is_first_time_scrobbling: bool) -> int:
+        """Size of the window (in seconds) the batch is spread across."""
         # --- DYNAMIC WINDOW CALCULATION ---
         # We assume an average of 4 minutes (240 seconds) per song.
         estimated_listening_duration = total_songs_to_scrobble * 240
@@ -122,8 +196,12 @@ class ScrobbleTimestampCalculator:
             distribution_seconds = 86400
             
         # ----------------------------------
-
-        min_offset = 30  # Minimum 30 seconds ago
+        return distribution_seconds
+    
+    @staticmethod
+    def _offset_seconds(songs_scrobbled_so_far: int, total_songs_to_scrobble: int, distribution_seconds: int) -> float:
+        """How far before 'now' the song at this position is placed."""
+        min_offset = _MIN_OFFSET_SECONDS
         
         # Calculate position ratio (0 = most recent, 1 = oldest)
         position_ratio = songs_scrobbled_so_far / (total_songs_to_scrobble - 1)
@@ -131,10 +209,100 @@ class ScrobbleTimestampCalculator:
         # Use logarithmic distribution to keep recent songs closer to 'now'
         # while respecting the calculated duration for older songs.
         max_offset = distribution_seconds
-        log_scale = math.log(1 + position_ratio * (math.e - 1))
-        offset = min_offset + (max_offset - min_offset) * log_scale
+        log_scale = math.log1p(position_ratio * _E_MINUS_1)
+        return min_offset + (max_offset - min_offset) * log_scale
+    
+    @staticmethod
+    def calculate_scrobble_timestamp(
+        songs_scrobbled_so_far: int,
+        total_songs_to_scrobble: int,
+        is_pro_user: bool = False,
+        is_first_time_scrobbling: bool = False
+    ) -> str:
+        """
+        Calculate timestamp using a DYNAMIC window based on song count.
+        This prevents 'Overlap' where a new batch of songs gets pushed 
+        so far back in time that it mixes with the previous batch.
+        """
+        now = int(time.time())
+        
+        # If only one song, place it 30 seconds ago
+        if total_songs_to_scrobble == 1:
+            return str(now - 30)
+        
+        distribution_seconds = ScrobbleTimestampCalculator._distribution_seconds(
+            total_songs_to_scrobble, is_first_time_scrobbling
+        )
+        offset = ScrobbleTimestampCalculator._offset_seconds(
+            songs_scrobbled_so_far, total_songs_to_scrobble, distribution_seconds
+        )
         
         return str(int(now - offset))
+    
+    @staticmethod
+    def calculate_batch_timestamps(
+        total_songs_to_scrobble: int,
+        is_pro_user: bool = False,
+        is_first_time_scrobbling: bool = False
+    ) -> List[str]:
+        """
+        Calculate timestamps for a whole batch in one pass.
+        Index i holds the timestamp for the i-th song scrobbled; all entries
+        share the same 'now' and window so the batch is internally consistent.
+        """
+        if total_songs_to_scrobble <= 0:
+            return []
+        
+        now = int(time.time())
+        
+        # If only one song, place it 30 seconds ago
+        if total_songs_to_scrobble == 1:
+            return [str(now - 30)]
+        
+        distribution_seconds = ScrobbleTimestampCalculator._distribution_seconds(
+            total_songs_to_scrobble, is_first_time_scrobbling
+        )
+        return [
+            str(int(now - ScrobbleTimestampCalculator._offset_seconds(
+                position, total_songs_to_scrobble, distribution_seconds
+            )))
+            for position in range(total_songs_to_scrobble)
+        ]
+
+
+def _keyword_regex(keywords: List[str]) -> re.Pattern:
+    """Compile a case-sensitive literal alternation matching any keyword."""
+    return re.compile('|'.join(map(re.escape, keywords)))
+
+
+# Error message keywords per failure category, checked in this order
+_AUTH_ERROR_RE = _keyword_regex([
+    "401", "UNAUTHENTICATED", "authentication credential",
+    "Headers.append", "invalid header value", "Authentication required",
+    "cookie appears to be expired", "login is required", "__Secure-3PAPISID"
+])
+_TEMPORARY_ERROR_RE = _keyword_regex([
+    "503", "Service Unavailable", "502", "Bad Gateway",
+    "429", "Too Many Requests", "rate limit",
+    "temporarily unavailable", "try again later"
+])
+_NETWORK_ERROR_RE = _keyword_regex([
+    "Failed to fetch", "network", "timeout",
+    "ECONNRESET", "ENOTFOUND", "ConnectionError"
+])
+_LASTFM_ERROR_RE = _keyword_regex([
+    "audioscrobbler", "last.fm", "scrobble"
+])
+
+
+# Consecutive failures tolerated per failure type before deactivating a user
+_DEACTIVATION_THRESHOLDS = MappingProxyType({
+    FailureType.AUTH: 3,      # Auth issues are persistent
+    FailureType.NETWORK: 8,   # Network issues might be temporary
+    FailureType.TEMPORARY: 15, # Temporary issues should rarely deactivate users
+    FailureType.LASTFM: 5,    # Last.fm issues might be temporary
+    FailureType.UNKNOWN: 7,   # Give more chances for unknown errors
+})
 
 
 class ErrorCategorizer:
@@ -146,32 +314,19 @@ class ErrorCategorizer:
         error_message = str(error)
         
         # Authentication errors
-        if any(keyword in error_message for keyword in [
-            "401", "UNAUTHENTICATED", "authentication credential",
-            "Headers.append", "invalid header value", "Authentication required",
-            "cookie appears to be expired", "login is required", "__Secure-3PAPISID"
-        ]):
+        if _AUTH_ERROR_RE.search(error_message):
             return FailureType.AUTH
         
         # Temporary service errors (503, 502, 429, rate limits)
-        if any(keyword in error_message for keyword in [
-            "503", "Service Unavailable", "502", "Bad Gateway",
-            "429", "Too Many Requests", "rate limit",
-            "temporarily unavailable", "try again later"
-        ]):
+        if _TEMPORARY_ERROR_RE.search(error_message):
             return FailureType.TEMPORARY
         
         # Network/YouTube Music errors
-        if any(keyword in error_message for keyword in [
-            "Failed to fetch", "network", "timeout",
-            "ECONNRESET", "ENOTFOUND", "ConnectionError"
-        ]):
+        if _NETWORK_ERROR_RE.search(error_message):
             return FailureType.NETWORK
         
         # Last.fm specific errors
-        if any(keyword in error_message for keyword in [
-            "audioscrobbler", "last.fm", "scrobble"
-        ]):
+        if _LASTFM_ERROR_RE.search(error_message):
             return FailureType.LASTFM
         
         return FailureType.UNKNOWN
@@ -179,15 +334,7 @@ class ErrorCategorizer:
     @staticmethod
     def should_deactivate_user(failure_type: FailureType, consecutive_failures: int) -> bool:
         """Determine if user should be deactivated based on failure type and count"""
-        thresholds = {
-            FailureType.AUTH: 3,      # Auth issues are persistent
-            FailureType.NETWORK: 8,   # Network issues might be temporary
-            FailureType.TEMPORARY: 15, # Temporary issues should rarely deactivate users
-            FailureType.LASTFM: 5,    # Last.fm issues might be temporary
-            FailureType.UNKNOWN: 7,   # Give more chances for unknown errors
-        }
-        
-        return consecutive_failures >= thresholds.get(failure_type, 7)
+        return consecutive_failures >= _DEACTIVATION_THRESHOLDS.get(failure_type, 7)
 
 
 class SmartScrobbler:
@@ -196,6 +343,7 @@ class SmartScrobbler:
     def __init__(self, last_fm_api_key: str, last_fm_api_secret: str, dry_run: bool = False):
         self.last_fm_api_key = last_fm_api_key
         self.last_fm_api_secret = last_fm_api_secret
+        self._api_secret_bytes = last_fm_api_secret.encode('utf-8')
         self.dry_run = dry_run
         self.timestamp_calculator = ScrobbleTimestampCalculator()
         self.error_categorizer = ErrorCategorizer()
@@ -203,109 +351,70 @@ class SmartScrobbler:
     
     def _sanitize_string(self, s: str) -> str:
         """Sanitize string for Last.fm API"""
-        
-        # --- PHASE 1: NUCLEAR CLEANING ---
-        s = clean_metadata(s)
-        # ---------------------------------
-
-        # --- PHASE 2: TECHNICAL SANITIZATION ---
-        s = re.sub(r'\\u([0-9A-Fa-f]{4})', lambda m: chr(int(m.group(1), 16)), s)
-        
-        replacements = {
-            '\u2026': '...',  # ellipsis
-            '\u2013': '-',    # en dash
-            '\u2014': '-',    # em dash
-            '\u2018': "'",    # left single quotation mark
-            '\u2019': "'",    # right single quotation mark
-            '\u201C': '"',    # left double quotation mark
-            '\u201D': '"',    # right double quotation mark
-        }
-        
-        for old, new in replacements.items():
-            s = s.replace(old, new)
-        
-        # Remove control characters and invalid Unicode
-        s = re.sub(r'[\u0000-\u001F\u007F\uFFFE\uFFFF]', '', s)
-        
-        return s
+        return sanitize_for_lastfm(s)
     
     def _hash_request(self, params: Dict[str, str]) -> str:
         """Create MD5 hash for Last.fm API request"""
-        string = ""
-        for key in sorted(params.keys()):
-            string += key + params[key]
-        string += self.last_fm_api_secret
-        return hashlib.md5(string.encode('utf-8')).hexdigest()
+        request_hash = hashlib.md5()
+        for key in sorted(params):
+            request_hash.update(key.encode('utf-8'))
+            request_hash.update(params[key].encode('utf-8'))
+        request_hash.update(self._api_secret_bytes)
+        return request_hash.hexdigest()
     
-    def scrobble_song(
+    def scrobble_batch(
         self,
-        song: Dict[str, str],
+        songs: List[Dict[str, str]],
         last_fm_session_key: str,
-        timestamp: str
-    ) -> bool:
+        timestamps: List[str]
+    ) -> List[bool]:
         """
-        Scrobble a single song to Last.fm.
-        Strictly requires Artist, Title, AND Album to prevent duplicates/bad data.
+        Scrobble up to LASTFM_MAX_BATCH_SIZE songs to Last.fm in one request.
+        Returns one success flag per song, in order. Songs whose Artist, Title
+        or Album is missing or sanitizes to empty are not sent and report False,
+        so one bad track cannot get the whole request rejected.
+        Raises RuntimeError when Last.fm rejects the request as a whole, so the
+        caller can leave the batch unrecorded and retry it on the next run.
         """
-        # --- STRICT METADATA CHECK ---
-        # Filters out "Video" states or incomplete loads that cause double scrobbles.
-        # We use .get() to avoid KeyErrors if a field is missing entirely.
-        if not (song.get('artist') and song.get('title') and song.get('album')):
-            # Optional: detailed logging if you need to debug specific skipped tracks
-            # print(f"  ⏭️  Skipping: '{song.get('title', 'Unknown')}' - Missing metadata")
-            return False
-        # -----------------------------
+        if len(songs) > LASTFM_MAX_BATCH_SIZE:
+            raise ValueError(f"Last.fm accepts at most {LASTFM_MAX_BATCH_SIZE} scrobbles per request")
+
+        results = [False] * len(songs)
+        batch = []
+        for index, (song, timestamp) in enumerate(zip(songs, timestamps)):
+            track = self._sanitize_string(song.get('title') or '')
+            artist = self._sanitize_string(song.get('artist') or '')
+            album = self._sanitize_string(song.get('album') or '')
+            if not (track and artist and album):
+                continue
+            batch.append((index, track, artist, album, timestamp))
+
+        if not batch:
+            return results
 
-        params = {
-            'album': self._sanitize_string(song['album']),
-            'api_key': self.last_fm_api_key,
-            'method': 'track.scrobble',
-            'timestamp': timestamp,
-            'track': self._sanitize_string(song['title']),
-            'artist': self._sanitize_string(song['artist']),
-            'sk': last_fm_session_key,
-        }
-        
-        # Create API signature
-        api_sig = self._hash_request(params)
-        
         if self.dry_run:
-            self.logger.info(f"[DRY RUN] Would scrobble: {song['title']} by {song['artist']}")
-            return True
-
-        try:
-            # Use lastpy for scrobbling
-            xml_response = lastpy.scrobble(
-                params['track'],
-                params['artist'],
-                params['album'],
-                last_fm_session_key,
-                timestamp
-            )
-
-            # Parse XML response
-            root = ET.fromstring(xml_response)
-            scrobbles = root.find('scrobbles')
-
-            if scrobbles is not None:
-                accepted = scrobbles.get('accepted', '0')
-                ignored = scrobbles.get('ignored', '0')
-
-                # Minimal logging for scrobble result
-                if accepted != '0':
-                    self.logger.debug(f"Scrobbled: {song['title']} by {song['artist']}")
-                elif ignored != '0':
-                    self.logger.warning(f"Ignored: {song['title']} by {song['artist']}")
-
-                # Return True if at least one scrobble was accepted
-                return accepted != '0' or ignored == '0'
+            for index, *_ in batch:
+                self.logger.info("[DRY RUN] Would scrobble: %s by %s", songs[index]['title'], songs[index]['artist'])
+                results[index] = True
+            return results
+
+        xml_response = lastpy.scrobble_batch(
+            [(track, artist, album, timestamp) for _, track, artist, album, timestamp in batch],
+            last_fm_session_key
+        )
 
-            self.logger.error(f"No scrobbles element found in XML response: {xml_response}")
-            return False
+        statuses = parse_batch_scrobble_statuses(xml_response)
+        if statuses is None or len(statuses) != len(batch):
+            raise RuntimeError(f"Unexpected scrobbles element in XML response: {xml_response}")
 
-        except Exception as e:
-            # Errors are handled by the caller in ImprovedProcess.execute
-            raise e
+        for (index, *_), accepted in zip(batch, statuses):
+            song = songs[index]
+            if accepted:
+                self.logger.debug("Scrobbled: %s by %s", song['title'], song['artist'])
+            else:
+                self.logger.warning("Ignored: %s by %s", song['title'], song['artist'])
+            results[index] = accepted
+        return results
 
     def love_song(
         self,
@@ -332,7 +441,7 @@ class SmartScrobbler:
         params['api_sig'] = self._hash_request(params)
 
         if self.dry_run:
-            self.logger.info(f"[DRY RUN] Would love: {song['title']} by {song['artist']}")
+            self.logger.info("[DRY RUN] Would love: %s by %s", song['title'], song['artist'])
             return "loved"
 
         try:
@@ -377,6 +486,17 @@ class SmartScrobbler:
             position, total, is_pro_user, is_first_time
         )
     
+    def calculate_timestamps(
+        self,
+        total: int,
+        is_pro_user: bool = False,
+        is_first_time: bool = False
+    ) -> List[str]:
+        """Calculate timestamps for every position of a scrobble batch"""
+        return self.timestamp_calculator.calculate_batch_timestamps(
+            total, is_pro_user, is_first_time
+        )
+    
     def categorize_error(self, error: Exception) -> FailureType:
         """Categorize an error for smart handling"""
         return self.error_categorizer.categorize_error(error)
@@ -435,20 +555,21 @@ class PositionTracker:
                     'should_scrobble': False
                 })
         else:
+            # Map each database key to its saved position once; the first
+            # row for a key wins. Key membership doubles as the "seen" test.
+            db_positions = {}
+            for db_song in database_songs:
+                db_positions.setdefault(
+                    (db_song.get('title'), db_song.get('artist'), db_song.get('album')),
+                    db_song.get('array_position')
+                )
+
             # Regular processing: check for new songs and re-reproductions
             for i, song in valid_songs_with_indices:
                 current_position = i + 1
+                song_key = (song['title'], song['artist'], song['album'])
                 
-                # Find matching song in database
-                saved_song = None
-                for db_song in database_songs:
-                    if (db_song.get('title') == song['title'] and 
-                        db_song.get('artist') == song['artist'] and 
-                        db_song.get('album') == song['album']):
-                        saved_song = db_song
-                        break
-                
-                if not saved_song:
+                if song_key not in db_positions:
                     # New song - scrobble it
                     songs_to_scrobble.append({
                         'song': song,
@@ -456,14 +577,17 @@ class PositionTracker:
                         'reason': 'new_song',
                         'should_scrobble': True
                     })
-                elif current_position < saved_song.get('array_position', float('inf')):
+                    continue
+
+                saved_position = db_positions[song_key]
+                if saved_position is None or current_position < saved_position:
                     # Re-reproduction - song moved up in the list
                     songs_to_scrobble.append({
                         'song': song,
                         'position': current_position,
                         'reason': 'reproduction',
                         'should_scrobble': True,
-                        'previous_position': saved_song.get('array_position')
+                        'previous_position': saved_position
                     })
                 else:
                     # Song exists and hasn't moved up - just update position
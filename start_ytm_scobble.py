@@ -1,12 +1,9 @@
 import os
 import argparse
 import http.server
+import re
 import socketserver
-import sqlite3
-import threading
-import time
 import webbrowser
-import xml.etree.ElementTree as ET
 import logging
 from collections import Counter
 from datetime import datetime, timedelta
@@ -22,12 +19,14 @@ from date_detection import (
     is_today_song,
 )
 from notifications import send_success_notification
-from scrobble_utils import FailureType, PositionTracker, SmartScrobbler
+from scrobble_store import ScrobbleStore
+from scrobble_utils import LASTFM_MAX_BATCH_SIZE, FailureType, PositionTracker, SmartScrobbler
 from song_matching import normalize_song_key
-from ytmusic_fetcher import get_ytmusic_history, get_ytmusic_liked_song_keys
+from ytmusic_fetcher import YTMusicFetcher
 
 AVG_TRACK_MINUTES = 4
 DEFAULT_SCROBBLE_TIMEZONE = "Asia/Kolkata"
+_SESSION_KEY_RE = re.compile(r'<key>([^<]+)</key>')
 
 
 def get_scrobble_timezone() -> ZoneInfo:
@@ -119,7 +118,9 @@ class TokenHandler(http.server.SimpleHTTPRequestHandler):
             http.server.SimpleHTTPRequestHandler.do_GET(self)
 
 
-class TokenServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+class TokenServer(socketserver.TCPServer):
+    # Requests are handled synchronously so get_token can serve them one at a
+    # time on the main thread until the callback carrying the token arrives.
     token = None
 
 
@@ -149,43 +150,7 @@ class ImprovedProcess:
         self.scrobbler = SmartScrobbler(self.api_key, self.api_secret, dry_run=self.dry_run)
         self.position_tracker = PositionTracker()
 
-        self.conn = sqlite3.connect('./data.db')
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS scrobbles (
-                id INTEGER PRIMARY KEY,
-                track_name TEXT,
-                artist_name TEXT,
-                album_name TEXT,
-                scrobbled_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                array_position INTEGER,
-                max_array_position INTEGER,
-                is_first_time_scrobble BOOLEAN DEFAULT FALSE
-            )
-        ''')
-        
-        try:
-            cursor.execute('ALTER TABLE scrobbles ADD COLUMN max_array_position INTEGER')
-        except sqlite3.OperationalError:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE scrobbles ADD COLUMN is_first_time_scrobble BOOLEAN DEFAULT FALSE')
-        except sqlite3.OperationalError:
-            pass
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS loved_tracks (
-                id INTEGER PRIMARY KEY,
-                track_name TEXT,
-                artist_name TEXT,
-                loved_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(track_name, artist_name)
-            )
-        ''')
-
-        self.conn.commit()
-        cursor.close()
+        self.store = ScrobbleStore()
 
     def get_token(self):
         logger.info("Waiting for Last.fm authentication...")
@@ -193,28 +158,42 @@ class ImprovedProcess:
         
         with TokenServer(('localhost', 5588), TokenHandler) as httpd:
             webbrowser.open(auth_url)
-            thread = threading.Thread(target=httpd.serve_forever)
-            thread.start()
-            while True:
-                if httpd.token:
-                    token = httpd.token
-                    httpd.shutdown()
-                    break
-                time.sleep(0.1)
+            while httpd.token is None:
+                httpd.handle_request()
+            token = httpd.token
         return token
 
     def get_session(self, token):
         logger.info("Getting Last.fm session...")
         xml_response = lastpy.authorize(token)
         try:
-            root = ET.fromstring(xml_response)
-            session_key = root.find('session/key').text
+            session_key = _SESSION_KEY_RE.search(xml_response).group(1)
             set_key('.env', 'LASTFM_SESSION', session_key)
             return session_key
         except Exception as e:
             logger.error(f"Error getting session: {xml_response}")
             raise Exception(e)
 
+    def scrobble_in_batches(self, songs_to_scrobble, timestamps):
+        """
+        Scrobble songs in Last.fm-sized batches, one request per batch.
+        Returns one outcome per song: the success flag, or the exception raised
+        by its batch. Batches after an authentication error are not sent.
+        """
+        outcomes = [False] * len(songs_to_scrobble)
+        for start in range(0, len(songs_to_scrobble), LASTFM_MAX_BATCH_SIZE):
+            end = start + LASTFM_MAX_BATCH_SIZE
+            batch = songs_to_scrobble[start:end]
+            try:
+                outcomes[start:end] = self.scrobbler.scrobble_batch(
+                    [item['song'] for item in batch], self.session, timestamps[start:end]
+                )
+            except Exception as error:
+                outcomes[start:end] = [error] * len(batch)
+                if self.scrobbler.categorize_error(error) == FailureType.AUTH:
+                    break
+        return outcomes
+
     def execute(self):
         """Main execution logic"""
         if not self.session:
@@ -226,7 +205,7 @@ class ImprovedProcess:
                     token = self.get_token()
                     self.session = self.get_session(token)
                 except Exception as e:
-                    logger.error(f"Failed to authenticate with Last.fm: {e}")
+                    logger.error("Failed to authenticate with Last.fm: %s", e)
                     return False
 
         if self.dry_run:
@@ -235,46 +214,36 @@ class ImprovedProcess:
 
         logger.info("Fetching YouTube Music history...")
         try:
-            history = get_ytmusic_history()
-            liked_song_keys = get_ytmusic_liked_song_keys()
+            fetcher = YTMusicFetcher()
+            history = fetcher.get_history()
+            liked_song_keys = fetcher.get_liked_song_keys()
         except FileNotFoundError as e:
-            logger.error(f"{e}")
+            logger.error("%s", e)
             logger.error("Please ensure 'browser.json' or 'browser.json.enc' with YTMUSIC_AUTH_KEY is provided.")
             return False
         except Exception as error:
-            logger.error(f"An error occurred while fetching history: {error}")
+            logger.error("An error occurred while fetching history: %s", error)
             return False
 
         today_songs = [song for song in history if is_today_song(song.get('playedAt'))]
         
         if not today_songs:
-            logger.info(f"History: {len(history)} | Today: 0 | Existing: 0 | To Scrobble: 0")
+            logger.info("History: %d | Today: 0 | Existing: 0 | To Scrobble: 0", len(history))
             logger.info("No songs played today. Nothing to scrobble.")
             return True
 
-        cursor = self.conn.cursor()
-        db_songs = cursor.execute('''
-            SELECT track_name, artist_name, album_name, array_position, 
-                   max_array_position, is_first_time_scrobble
-            FROM scrobbles
-        ''').fetchall()
+        db_songs = self.store.load_scrobbles()
         
         database_songs = [{'title': r[0], 'artist': r[1], 'album': r[2], 'array_position': r[3], 'max_array_position': r[4] or r[3], 'is_first_time': bool(r[5])} for r in db_songs]
 
         is_first_time = len(database_songs) == 0
         
         if database_songs:
-            songs_to_delete = [db_song for db_song in database_songs if not any(
-                (today_song['title'] == db_song['title'] and
-                 today_song['artist'] == db_song['artist'] and
-                 today_song['album'] == db_song['album'])
-                for today_song in today_songs
-            )]
-
-            if songs_to_delete:
-                for song in songs_to_delete:
-                    cursor.execute('DELETE FROM scrobbles WHERE track_name = ? AND artist_name = ? AND album_name = ?', (song['title'], song['artist'], song['album']))
-                self.conn.commit()
+            today_keys = {(song['title'], song['artist'], song['album']) for song in today_songs}
+            keys_to_delete = {r[:3] for r in db_songs} - today_keys
+
+            if keys_to_delete:
+                self.store.delete_scrobbles(keys_to_delete)
 
         songs_to_process = self.position_tracker.detect_songs_to_scrobble(
             today_songs, database_songs, is_first_time, 10
@@ -284,8 +253,15 @@ class ImprovedProcess:
         total_to_scrobble = len(songs_to_scrobble)
         existing_count = len(songs_to_process) - total_to_scrobble
 
-        logger.info(f"History: {len(history)} | Today: {len(today_songs)} | Existing: {existing_count} | To Scrobble: {total_to_scrobble}")
+        logger.info(
+            "History: %d | Today: %d | Existing: %d | To Scrobble: %d",
+            len(history), len(today_songs), existing_count, total_to_scrobble
+        )
 
+        timestamps = self.scrobbler.calculate_timestamps(
+            total_to_scrobble, is_first_time=is_first_time
+        )
+        scrobble_outcomes = self.scrobble_in_batches(songs_to_scrobble, timestamps)
         songs_scrobbled = 0
         scrobble_position = 0
         failed_songs = []
@@ -294,6 +270,8 @@ class ImprovedProcess:
         love_failed_count = 0
         loved_songs = []
         love_failed_songs = []
+        position_rows = []
+        songs_to_love = []
 
         for item in songs_to_process:
             song = item['song']
@@ -302,64 +280,73 @@ class ImprovedProcess:
             
             try:
                 if should_scrobble:
-                    timestamp = self.scrobbler.calculate_timestamp(
-                        scrobble_position, total_to_scrobble, is_first_time=is_first_time
-                    )
-                    success = self.scrobbler.scrobble_song(song, self.session, timestamp)
+                    outcome = scrobble_outcomes[scrobble_position]
+                    scrobble_position += 1
+                    if isinstance(outcome, Exception):
+                        raise outcome
+                    success = outcome
                     
                     if success:
                         songs_scrobbled += 1
-                        scrobble_position += 1
                         scrobbled_songs.append(f"{song['title']} — {song['artist']}")
-
-                        song_key = normalize_song_key(song.get('title'), song.get('artist'))
-                        already_loved = cursor.execute(
-                            'SELECT 1 FROM loved_tracks WHERE track_name = ? AND artist_name = ?',
-                            (song['title'], song['artist'])
-                        ).fetchone()
-                        if song_key in liked_song_keys and not already_loved:
-                            love_status = self.scrobbler.love_song(song, self.session)
-                            if love_status == "loved":
-                                loved_count += 1
-                                loved_songs.append(f"{song['title']} — {song['artist']}")
-                                if not self.dry_run:
-                                    cursor.execute(
-                                        'INSERT OR IGNORE INTO loved_tracks (track_name, artist_name) VALUES (?, ?)',
-                                        (song['title'], song['artist'])
-                                    )
-                            elif love_status == "failed":
-                                love_failed_count += 1
-                                love_failed_songs.append(f"{song['title']} — {song['artist']}")
+                        songs_to_love.append(song)
                     else:
                         failed_songs.append(f"{song['title']} by {song['artist']}")
                 
                 if not self.dry_run:
-                    existing_song = cursor.execute('SELECT id, max_array_position FROM scrobbles WHERE track_name = ? AND artist_name = ? AND album_name = ?', (song['title'], song['artist'], song['album'])).fetchone()
-                    
-                    if existing_song:
-                        song_id, current_max = existing_song
-                        new_max = max(current_max or position, position)
-                        cursor.execute('UPDATE scrobbles SET array_position = ?, max_array_position = ?, scrobbled_at = CURRENT_TIMESTAMP WHERE id = ?', (position, new_max, song_id))
-                    else:
-                        cursor.execute('INSERT INTO scrobbles (track_name, artist_name, album_name, array_position, max_array_position, is_first_time_scrobble) VALUES (?, ?, ?, ?, ?, ?)', (song['title'], song['artist'], song['album'], position, position, is_first_time))
-                    
-                    self.conn.commit()
+                    position_rows.append((song['title'], song['artist'], song['album'], position, is_first_time))
                 else:
-                    logger.debug(f"Dry run: Skipping database update for {song['title']}")
+                    logger.debug("Dry run: Skipping database update for %s", song['title'])
                 
             except Exception as error:
                 failure_type = self.scrobbler.categorize_error(error)
-                logger.error(f"Failed to process '{song['title']}' by {song['artist']}: {error} (Type: {failure_type.value})")
+                logger.error(
+                    "Failed to process '%s' by %s: %s (Type: %s)",
+                    song['title'], song['artist'], error, failure_type.value
+                )
                 if failure_type == FailureType.AUTH:
                     logger.critical("Last.fm authentication error detected. Stopping execution.")
                     break
                 failed_songs.append(f"{song['title']} by {song['artist']}")
 
-        cursor.close()
+        # Every batch has already been sent, so persist all positions in one
+        # transaction before the slow love_song calls; an interrupt while loving
+        # must not get this run's scrobbles sent again next time.
+        if position_rows:
+            self.store.upsert_positions(position_rows)
+            self.store.commit()
+
+        for song in songs_to_love:
+            try:
+                song_key = normalize_song_key(song.get('title'), song.get('artist'))
+                if song_key not in liked_song_keys or self.store.is_loved(song['title'], song['artist']):
+                    continue
+                love_status = self.scrobbler.love_song(song, self.session)
+                if love_status == "loved":
+                    loved_count += 1
+                    loved_songs.append(f"{song['title']} — {song['artist']}")
+                    if not self.dry_run:
+                        self.store.mark_loved(song['title'], song['artist'])
+                elif love_status == "failed":
+                    love_failed_count += 1
+                    love_failed_songs.append(f"{song['title']} — {song['artist']}")
+            except Exception as error:
+                failure_type = self.scrobbler.categorize_error(error)
+                logger.error(
+                    "Failed to love '%s' by %s: %s (Type: %s)",
+                    song['title'], song['artist'], error, failure_type.value
+                )
+                love_failed_count += 1
+                love_failed_songs.append(f"{song['title']} — {song['artist']}")
+                if failure_type == FailureType.AUTH:
+                    logger.critical("Last.fm authentication error detected. Stopping execution.")
+                    break
+
+        self.store.commit()
 
         logger.info(
-            f"SUMMARY: Processed: {len(songs_to_process)}, Success: {songs_scrobbled}, "
-            f"Failed: {len(failed_songs)}, Loved: {loved_count}, LoveFailed: {love_failed_count}"
+            "SUMMARY: Processed: %d, Success: %d, Failed: %d, Loved: %d, LoveFailed: %d",
+            len(songs_to_process), songs_scrobbled, len(failed_songs), loved_count, love_failed_count
         )
 
         report_now = get_scrobble_now()
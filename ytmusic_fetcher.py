@@ -49,16 +49,17 @@ class YTMusicFetcher:
         """
         history = self.ytmusic.get_history()
         songs = []
+        append = songs.append
+        join = ', '.join
         for item in history:
-            artist_name = ', '.join([artist['name'] for artist in item['artists']]) if item.get('artists') else None
-            album_name = item['album']['name'] if item.get('album') else None
-            played_at = item.get('played')
+            artists = item.get('artists')
+            album = item.get('album')
 
-            songs.append({
+            append({
                 "title": item['title'],
-                "artist": artist_name,
-                "album": album_name,
-                "playedAt": played_at,
+                "artist": join([artist['name'] for artist in artists]) if artists else None,
+                "album": album['name'] if album else None,
+                "playedAt": item.get('played'),
             })
         return songs
 